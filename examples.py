@@ -5,30 +5,48 @@ Example usage of the file_renamer.py script
 This script demonstrates different ways to use the file renaming tool.
 """
 
-import subprocess
+import contextlib
+import io
 import sys
 from pathlib import Path
 
-def run_command(command, description):
-    """Run a command and print the description."""
+def run_command(args, description):
+    """Run file_renamer in-process with the given arguments and print the description."""
     print(f"\n{'='*60}")
     print(f"EXAMPLE: {description}")
-    print(f"COMMAND: {command}")
+    print(f"COMMAND: {' '.join(['python3', 'file_renamer.py'] + args)}")
     print('='*60)
     
     # Ask user if they want to run this example
     response = input("Run this example? (y/n): ").lower().strip()
     if response == 'y':
+        # main() checked that file_renamer.py exists; after the first
+        # example this import is just a lookup in sys.modules
+        import file_renamer
+        
+        # Calling main() directly avoids starting a new interpreter per example;
+        # log messages still go straight to stderr
+        stdout = io.StringIO()
+        returncode = 0
         try:
-            result = subprocess.run(command.split(), capture_output=True, text=True)
-            print("STDOUT:")
-            print(result.stdout)
-            if result.stderr:
-                print("STDERR:")
-                print(result.stderr)
-            print(f"Return code: {result.returncode}")
+            with contextlib.redirect_stdout(stdout):
+                file_renamer.main(args)
+        except SystemExit as e:
+            # argparse exits for --help and usage errors
+            if e.code is None:
+                returncode = 0
+            else:
+                returncode = e.code if isinstance(e.code, int) else 1
         except Exception as e:
             print(f"Error running command: {e}")
+            return
+        finally:
+            # Logging is written by a background thread; let it finish so log
+            # lines don't show up after the summary or the next prompt
+            file_renamer.flush_logging()
+        print("STDOUT:")
+        print(stdout.getvalue())
+        print(f"Return code: {returncode}")
     else:
         print("Skipped.")
 
@@ -45,31 +63,31 @@ def main():
     
     # Example 1: Basic usage
     run_command(
-        "python3 file_renamer.py --help",
+        ["--help"],
         "Show help and available options"
     )
     
     # Example 2: Basic file processing
     run_command(
-        "python3 file_renamer.py",
+        [],
         "Process all files in input_files/ and move to output_files/"
     )
     
     # Example 3: Copy mode
     run_command(
-        "python3 file_renamer.py --copy",
+        ["--copy"],
         "Copy files instead of moving them"
     )
     
     # Example 4: Specific file types
     run_command(
-        "python3 file_renamer.py --extensions .txt .pdf",
+        ["--extensions", ".txt", ".pdf"],
         "Process only .txt and .pdf files"
     )
     
     # Example 5: Custom directories
     run_command(
-        "python3 file_renamer.py -i ./input_files -o ./archived_files",
+        ["-i", "./input_files", "-o", "./archived_files"],
         "Use custom input and output directories"
     )
     
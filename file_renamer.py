@@ -10,49 +10,257 @@ Date: August 8, 2025
 """
 
 import os
+import platform
+import sys
 import shutil
+import stat
 import argparse
+import atexit
+import ctypes
+import errno
+import queue
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
+from itertools import islice
+from operator import attrgetter
 from pathlib import Path
 import logging
+import logging.handlers
+
+
+# On macOS, use st_birthtime for creation time
+# On other systems, fall back to st_ctime
+# (resolved once at import rather than probed for every file)
+_creation_timestamp = attrgetter(
+    'st_birthtime' if hasattr(os.stat_result, 'st_birthtime') else 'st_ctime'
+)
+
+# statx(2) constants (linux/fcntl.h, linux/stat.h)
+_AT_FDCWD = -100
+_AT_STATX_DONT_SYNC = 0x4000
+_STATX_BTIME = 0x800
+
+
+class _StatxTimestamp(ctypes.Structure):
+    _fields_ = [
+        ('tv_sec', ctypes.c_int64),
+        ('tv_nsec', ctypes.c_uint32),
+        ('_reserved', ctypes.c_int32),
+    ]
+
+
+class _Statx(ctypes.Structure):
+    """Leading fields of struct statx, padded to the kernel's 256 bytes."""
+    _fields_ = [
+        ('stx_mask', ctypes.c_uint32),
+        ('stx_blksize', ctypes.c_uint32),
+        ('stx_attributes', ctypes.c_uint64),
+        ('stx_nlink', ctypes.c_uint32),
+        ('stx_uid', ctypes.c_uint32),
+        ('stx_gid', ctypes.c_uint32),
+        ('stx_mode', ctypes.c_uint16),
+        ('_spare0', ctypes.c_uint16),
+        ('stx_ino', ctypes.c_uint64),
+        ('stx_size', ctypes.c_uint64),
+        ('stx_blocks', ctypes.c_uint64),
+        ('stx_attributes_mask', ctypes.c_uint64),
+        ('stx_atime', _StatxTimestamp),
+        ('stx_btime', _StatxTimestamp),
+        ('_spare', ctypes.c_uint64 * 20),
+    ]
+
+
+def _load_statx():
+    """
+    Bind libc's statx and check once that the kernel supports it.
+    
+    Returns:
+        The statx function, or None when unavailable (non-Linux, glibc older
+        than 2.28, kernels before 4.11, or the syscall being filtered)
+    """
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        statx = ctypes.CDLL(None, use_errno=True).statx
+    except (OSError, AttributeError):
+        return None
+    statx.argtypes = [
+        ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_uint,
+        ctypes.POINTER(_Statx),
+    ]
+    statx.restype = ctypes.c_int
+    
+    buf = _Statx()
+    if statx(_AT_FDCWD, b'/', _AT_STATX_DONT_SYNC, _STATX_BTIME, ctypes.byref(buf)) != 0:
+        return None
+    return statx
+
+
+_STATX = _load_statx()
+
+
+def _statx_birthtime(file_path):
+    """
+    Read only the birth time of a file through statx.
+    
+    Args:
+        file_path (str): Path to the file
+        
+    Returns:
+        float: Birth time as a timestamp, or None if the filesystem doesn't
+        record one
+    """
+    buf = _Statx()
+    if _STATX(_AT_FDCWD, os.fsencode(file_path), _AT_STATX_DONT_SYNC,
+              _STATX_BTIME, ctypes.byref(buf)) != 0:
+        err = ctypes.get_errno()
+        raise OSError(err, os.strerror(err), str(file_path))
+    if not buf.stx_mask & _STATX_BTIME:
+        return None
+    return buf.stx_btime.tv_sec + buf.stx_btime.tv_nsec / 1e9
+
+
+# renameat2(2) flag and raw syscall numbers, for glibc builds without the wrapper
+_RENAME_NOREPLACE = 1
+_SYS_RENAMEAT2 = {'x86_64': 316, 'aarch64': 276}
+
+
+def _load_renameat2():
+    """
+    Bind renameat2 on Linux, via glibc's wrapper (2.28+) or the raw syscall.
+    
+    Returns:
+        A function called as (olddirfd, oldpath, newdirfd, newpath, flags),
+        or None when unavailable
+    """
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+    except OSError:
+        return None
+    argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p, ctypes.c_uint]
+    
+    renameat2 = getattr(libc, 'renameat2', None)
+    if renameat2 is not None:
+        renameat2.argtypes = argtypes
+        renameat2.restype = ctypes.c_int
+        return renameat2
+    
+    number = _SYS_RENAMEAT2.get(platform.machine())
+    syscall = getattr(libc, 'syscall', None)
+    if number is None or syscall is None:
+        return None
+    syscall.argtypes = [ctypes.c_long] + argtypes
+    syscall.restype = ctypes.c_long
+    return partial(syscall, number)
+
+
+_RENAMEAT2 = _load_renameat2()
+
+
+# Copy file data inside the kernel on Linux: copy_file_range (which can
+# reflink on btrfs/XFS), then sendfile. Other platforms use shutil.copy2.
+_KERNEL_COPY = sys.platform.startswith('linux')
+_HAS_COPY_FILE_RANGE = hasattr(os, 'copy_file_range')
+_KERNEL_COPY_CHUNK = 1 << 30
+_COPY_BUFSIZE = 1 << 20
+
+# Errors meaning a copy method doesn't apply to this pair of files
+_COPY_FALLBACK_ERRNOS = frozenset({errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP})
+
+# Errors ignored when copying extended attributes (as shutil.copy2 does)
+_XATTR_IGNORED_ERRNOS = frozenset({errno.EPERM, errno.ENOTSUP, errno.ENODATA, errno.EINVAL})
+
+# Worker threads for directory processing (ThreadPoolExecutor's own default)
+_MAX_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+# Upper bound on the number of files handed to a worker per task
+_MAX_BATCH_SIZE = 256
+
+# Large directories are processed in inode order within blocks of this many
+# entries; directories with fewer than _INODE_SORT_MIN files keep readdir
+# order. Inode numbers come with readdir on POSIX, but cost a stat on Windows.
+_INODE_SORT = os.name != 'nt'
+_INODE_SORT_BLOCK = 4096
+_INODE_SORT_MIN = 1024
+
+
+# Queue feeding the background log listener, once setup_logging has run
+_log_queue = None
 
 
 def setup_logging():
-    """Set up logging configuration."""
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler('file_renamer.log'),
-            logging.StreamHandler()
-        ]
-    )
+    """
+    Set up logging configuration.
+    
+    Log calls only enqueue the record; a background QueueListener does the
+    file and console writes, keeping that I/O off the worker threads.
+    Does nothing if logging is already configured.
+    """
+    global _log_queue
+    if logging.getLogger().handlers:
+        return
+    
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    handlers = [
+        # Opened on the first record rather than at setup
+        logging.FileHandler('file_renamer.log', delay=True),
+        logging.StreamHandler()
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    _log_queue = queue.Queue(-1)
+    listener = logging.handlers.QueueListener(_log_queue, *handlers)
+    listener.start()
+    # Drain the queue before the interpreter exits
+    atexit.register(listener.stop)
+    
+    # The listener's handlers apply the real format
+    queue_handler = logging.handlers.QueueHandler(_log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    
+    logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
 
 
-def get_file_creation_time(file_path):
+def flush_logging():
+    """Wait until the background listener has written every queued record."""
+    if _log_queue is not None:
+        _log_queue.join()
+
+
+def get_file_creation_time(file_path, stat_result=None):
     """
     Get the creation time of a file.
     
     Args:
-        file_path (str): Path to the file
+        file_path (str or os.DirEntry): Path to the file; for a DirEntry its
+            cached stat is used if a stat is needed
+        stat_result (os.stat_result): Already fetched stats for the file;
+            avoids a second stat call when given
         
     Returns:
         datetime: Creation time of the file
     """
     try:
-        # Get file stats
-        stat = os.stat(file_path)
+        # On Linux, ask statx for just the birth time
+        creation_time = _statx_birthtime(file_path) if _STATX is not None else None
         
-        # On macOS, use st_birthtime for creation time
-        # On other systems, fall back to st_ctime
-        if hasattr(stat, 'st_birthtime'):
-            creation_time = stat.st_birthtime
-        else:
-            creation_time = stat.st_ctime
+        if creation_time is None:
+            # Get file stats, only now that they are needed
+            if stat_result is None:
+                if isinstance(file_path, os.DirEntry):
+                    stat_result = file_path.stat()
+                else:
+                    stat_result = os.stat(file_path)
+            creation_time = _creation_timestamp(stat_result)
             
         return datetime.fromtimestamp(creation_time)
     except Exception as e:
-        logging.error(f"Error getting creation time for {file_path}: {e}")
+        logging.error(f"Error getting creation time for {os.fspath(file_path)}: {e}")
         return None
 
 
@@ -66,60 +274,266 @@ def format_datetime_prefix(dt):
     Returns:
         str: Formatted prefix string
     """
-    return dt.strftime("%y%m%d_%H%M%S_")
+    # Equivalent to dt.strftime("%y%m%d_%H%M%S_") without the format parsing
+    return (f"{dt.year % 100:02d}{dt.month:02d}{dt.day:02d}_"
+            f"{dt.hour:02d}{dt.minute:02d}{dt.second:02d}_")
 
 
-def rename_file(source_path, destination_dir, copy_mode=False):
+def _create_placeholder(destination_path):
+    """Create an empty file, raising FileExistsError if the name is taken."""
+    os.close(os.open(destination_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644))
+
+
+def _remove_placeholder(destination_path):
+    """Remove a reserved destination after a failed transfer."""
+    try:
+        os.unlink(destination_path)
+    except OSError:
+        pass
+
+
+def _claim_destination(destination_dir, date_prefix, original_name, claim=_create_placeholder):
     """
-    Rename a file by adding creation date prefix.
+    Atomically claim a free destination filename.
+    
+    Each candidate name is handed to claim, which must fail with
+    FileExistsError if the name is taken. By default the name is created with
+    O_CREAT | O_EXCL, so testing for a conflict and reserving the name is a
+    single syscall and concurrent runs can't pick the same name. On conflict
+    a counter is appended before the extension.
+    
+    Args:
+        destination_dir (str): Directory where the file will be placed,
+            ending in a path separator
+        date_prefix (str): Formatted creation date prefix
+        original_name (str): Original filename
+        claim (callable): Called with each candidate destination path
+        
+    Returns:
+        tuple: (destination_path, new_filename) of the claimed name
+    """
+    new_filename = f"{date_prefix}{original_name}"
+    counter = 1
+    while True:
+        destination_path = destination_dir + new_filename
+        try:
+            claim(destination_path)
+        except FileExistsError:
+            base_name, extension = os.path.splitext(original_name)
+            new_filename = f"{date_prefix}{base_name}_{counter:03d}{extension}"
+            counter += 1
+            continue
+        return destination_path, new_filename
+
+
+def _copy_file_data(src_fd, dst_fd, size):
+    """Copy everything from src_fd to dst_fd, from their current offsets."""
+    if _HAS_COPY_FILE_RANGE:
+        try:
+            # On kernels 5.3-5.18 copy_file_range can report 0 bytes straight
+            # away for files it can't handle (procfs/sysfs style); only trust
+            # an immediate 0 for a file that is really empty
+            if os.copy_file_range(src_fd, dst_fd, _KERNEL_COPY_CHUNK) or not size:
+                while os.copy_file_range(src_fd, dst_fd, _KERNEL_COPY_CHUNK):
+                    pass
+                return
+        except OSError as e:
+            if e.errno not in _COPY_FALLBACK_ERRNOS:
+                raise
+    try:
+        while os.sendfile(dst_fd, src_fd, None, _KERNEL_COPY_CHUNK):
+            pass
+        return
+    except OSError as e:
+        if e.errno not in _COPY_FALLBACK_ERRNOS:
+            raise
+    while True:
+        buf = os.read(src_fd, _COPY_BUFSIZE)
+        if not buf:
+            return
+        while buf:
+            buf = buf[os.write(dst_fd, buf):]
+
+
+def _copy_xattrs(src_fd, dst_fd):
+    """Copy extended attributes, skipping ones the destination rejects."""
+    try:
+        names = os.listxattr(src_fd)
+    except OSError as e:
+        if e.errno not in _XATTR_IGNORED_ERRNOS:
+            raise
+        return
+    for name in names:
+        try:
+            os.setxattr(dst_fd, name, os.getxattr(src_fd, name))
+        except OSError as e:
+            if e.errno not in _XATTR_IGNORED_ERRNOS:
+                raise
+
+
+def _copy_file(source_path, destination_path, stat_result=None):
+    """
+    Copy a file's data and metadata onto an existing destination (Linux).
+    
+    Equivalent to shutil.copy2, but the data never passes through user space
+    and the permission bits and timestamps come from the stat we already have
+    instead of being looked up again.
     
     Args:
         source_path (str): Path to the source file
+        destination_path (str): Path to the (reserved) destination file
+        stat_result (os.stat_result): Stats of the source file, if known
+    """
+    src_fd = os.open(source_path, os.O_RDONLY)
+    try:
+        st = stat_result if stat_result is not None else os.fstat(src_fd)
+        dst_fd = os.open(destination_path, os.O_WRONLY | os.O_TRUNC)
+        try:
+            _copy_file_data(src_fd, dst_fd, st.st_size)
+            _copy_xattrs(src_fd, dst_fd)
+            os.fchmod(dst_fd, stat.S_IMODE(st.st_mode))
+            os.utime(dst_fd, ns=(st.st_atime_ns, st.st_mtime_ns))
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+
+
+def _rename_noreplace(source_path, destination_path, stat_result=None):
+    """
+    Move within one filesystem without replacing an existing file.
+    
+    Uses renameat2(RENAME_NOREPLACE), so the conflict check and the rename
+    are one atomic syscall and no placeholder is needed. Raises
+    FileExistsError if the destination exists. Filesystems that don't
+    support the flag get a reserved placeholder renamed over instead, and
+    EXDEV (e.g. separate mounts of one filesystem, which share st_dev) gets
+    a reserved placeholder moved onto with _move_file.
+    """
+    if _RENAMEAT2(_AT_FDCWD, os.fsencode(source_path), _AT_FDCWD,
+                  os.fsencode(destination_path), _RENAME_NOREPLACE) == 0:
+        return
+    err = ctypes.get_errno()
+    if err == errno.EXDEV:
+        # Not renameable after all; os.replace would fail the same way
+        move = _move_file
+    elif err in (errno.ENOSYS, errno.EINVAL):
+        move = os.replace
+    else:
+        raise OSError(err, os.strerror(err), source_path, None, destination_path)
+    
+    _create_placeholder(destination_path)
+    try:
+        move(source_path, destination_path)
+    except BaseException:
+        _remove_placeholder(destination_path)
+        raise
+
+
+def _move_file(source_path, destination_path, stat_result=None):
+    """Move a file, copying across filesystems if needed."""
+    # Rename over the placeholder first, a single syscall wherever it works:
+    # shutil.move would fall back to a full copy on Windows, where os.rename
+    # refuses an existing target
+    try:
+        os.replace(source_path, destination_path)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(source_path, destination_path)
+
+
+def _copy2_file(source_path, destination_path, stat_result=None):
+    """Copy a file and its metadata with shutil.copy2."""
+    shutil.copy2(source_path, destination_path)
+
+
+# How files get to their destination: run(source_path, destination_path,
+# stat_result) does the transfer, verb is used in the log, claims_name
+# means run itself fails with FileExistsError on a taken name instead of
+# needing a reserved placeholder, and needs_stat means run makes use of
+# stat_result
+_Transfer = namedtuple('_Transfer', ['run', 'verb', 'claims_name', 'needs_stat'])
+
+
+def _select_transfer(copy_mode, same_fs):
+    """
+    Pick the transfer for a run, so the choice is made once rather than per
+    file.
+    
+    Returns:
+        _Transfer: The transfer to use
+    """
+    if copy_mode:
+        if _KERNEL_COPY:
+            return _Transfer(_copy_file, "Copied", False, True)
+        return _Transfer(_copy2_file, "Copied", False, False)
+    if same_fs and _RENAMEAT2 is not None:
+        return _Transfer(_rename_noreplace, "Moved", True, False)
+    return _Transfer(_move_file, "Moved", False, False)
+
+
+def rename_file(source_path, destination_dir, copy_mode=False, same_fs=False):
+    """
+    Rename a file by adding creation date prefix.
+    
+    The destination directory must already exist; callers create it once
+    rather than on every file.
+    
+    Args:
+        source_path (str or os.DirEntry): Path to the source file; a DirEntry
+            from os.scandir lets its cached stat be reused
         destination_dir (str): Directory where renamed file will be placed
         copy_mode (bool): If True, copy file instead of moving
+        same_fs (bool): If True, source and destination are likely on the
+            same filesystem, so a move can try renameat2 first
         
     Returns:
         tuple: (success, new_filename, error_message)
     """
+    return _rename_with(source_path, destination_dir, _select_transfer(copy_mode, same_fs))
+
+
+def _rename_with(source_path, destination_dir, transfer):
+    """rename_file with the transfer function already selected."""
     try:
-        source_path = Path(source_path)
-        destination_dir = Path(destination_dir)
+        # Plain strings and os.path keep Path objects out of the per-file path
+        entry = source_path if isinstance(source_path, os.DirEntry) else None
+        source_path = os.fspath(source_path)
+        destination_dir = os.path.join(os.fspath(destination_dir), '')
         
-        # Ensure destination directory exists
-        destination_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Get creation time
-        creation_time = get_file_creation_time(source_path)
+        # Get creation time; the entry is only stat-ed if statx can't help
+        creation_time = get_file_creation_time(entry if entry is not None else source_path)
         if creation_time is None:
             return False, None, "Could not retrieve file creation time"
         
+        # DirEntry caches its stat, so this is free if it was fetched above
+        stat_result = entry.stat() if entry is not None and transfer.needs_stat else None
+        
         # Generate new filename
         date_prefix = format_datetime_prefix(creation_time)
-        original_name = source_path.name
-        new_filename = f"{date_prefix}{original_name}"
-        
-        # Create destination path
-        destination_path = destination_dir / new_filename
-        
-        # Handle filename conflicts
-        counter = 1
-        while destination_path.exists():
-            name_parts = original_name.rsplit('.', 1)
-            if len(name_parts) == 2:
-                base_name, extension = name_parts
-                new_filename = f"{date_prefix}{base_name}_{counter:03d}.{extension}"
-            else:
-                new_filename = f"{date_prefix}{original_name}_{counter:03d}"
-            destination_path = destination_dir / new_filename
-            counter += 1
+        original_name = entry.name if entry is not None else os.path.basename(source_path)
         
-        # Move or copy the file
-        if copy_mode:
-            shutil.copy2(source_path, destination_path)
-            logging.info(f"Copied: {source_path.name} -> {new_filename}")
+        if transfer.claims_name:
+            # The transfer itself fails on a taken name (handles filename conflicts)
+            destination_path, new_filename = _claim_destination(
+                destination_dir, date_prefix, original_name,
+                lambda path: transfer.run(source_path, path, stat_result)
+            )
         else:
-            shutil.move(str(source_path), str(destination_path))
-            logging.info(f"Moved: {source_path.name} -> {new_filename}")
+            # Reserve a free destination name (handles filename conflicts)
+            destination_path, new_filename = _claim_destination(
+                destination_dir, date_prefix, original_name
+            )
+            
+            # Move or copy the file over the reserved placeholder
+            try:
+                transfer.run(source_path, destination_path, stat_result)
+            except BaseException:
+                # Don't leave an empty placeholder behind
+                _remove_placeholder(destination_path)
+                raise
+        logging.info(f"{transfer.verb}: {original_name} -> {new_filename}")
         
         return True, new_filename, None
         
@@ -129,6 +543,74 @@ def rename_file(source_path, destination_dir, copy_mode=False):
         return False, None, error_msg
 
 
+def _matches_extension(name, exts):
+    """Check a filename's extension against a set of lowercase extensions."""
+    ext = os.path.splitext(name)[1]
+    # Extensions are usually lowercase already; only fold case on a miss
+    return ext in exts or ext.lower() in exts
+
+
+def _rename_batch(entries, destination_dir, transfer):
+    """Rename a batch of files, returning the rename_file results in order."""
+    return [_rename_with(entry, destination_dir, transfer) for entry in entries]
+
+
+def _inode_ordered(entries):
+    """
+    Yield directory entries sorted by inode number, block by block.
+    
+    Statting and copying files in inode order keeps metadata reads on nearby
+    inode table blocks, which helps on cold caches. Sorting per block keeps
+    memory bounded; the resulting order is an implementation detail.
+    """
+    entries = iter(entries)
+    while True:
+        block = list(islice(entries, _INODE_SORT_BLOCK))
+        if len(block) >= _INODE_SORT_MIN:
+            block.sort(key=os.DirEntry.inode)
+        yield from block
+        if len(block) < _INODE_SORT_BLOCK:
+            return
+
+
+def _iter_batches(entries):
+    """
+    Group directory entries into batches for the worker pool.
+    
+    Batches start with a single file, so work begins immediately, and double
+    up to _MAX_BATCH_SIZE so scheduling overhead is paid per batch rather
+    than per file on large directories.
+    """
+    batch = []
+    batch_size = 1
+    for entry in entries:
+        batch.append(entry)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+            batch_size = min(batch_size * 2, _MAX_BATCH_SIZE)
+    if batch:
+        yield batch
+
+
+def _collect_batch(batch, future):
+    """
+    Wait for a submitted batch and log its failures.
+    
+    Returns:
+        tuple: (success_count, error_count) for the batch
+    """
+    success_count = 0
+    error_count = 0
+    for entry, (success, new_name, error) in zip(batch, future.result()):
+        if success:
+            success_count += 1
+        else:
+            error_count += 1
+            logging.error(f"Failed to process {entry.name}: {error}")
+    return success_count, error_count
+
+
 def process_directory(input_dir, output_dir, copy_mode=False, file_extensions=None):
     """
     Process all files in the input directory.
@@ -146,37 +628,86 @@ def process_directory(input_dir, output_dir, copy_mode=False, file_extensions=No
         logging.error(f"Input directory does not exist: {input_dir}")
         return
     
-    # Get all files in input directory
-    files = [f for f in input_path.iterdir() if f.is_file()]
-    
-    # Filter by extensions if provided
-    if file_extensions:
-        file_extensions = [ext.lower() for ext in file_extensions]
-        files = [f for f in files if f.suffix.lower() in file_extensions]
-    
-    if not files:
-        logging.warning("No files found to process")
-        return
-    
-    logging.info(f"Found {len(files)} files to process")
+    # Normalize the extension filter once so membership checks are O(1)
+    exts = frozenset(ext.lower() for ext in file_extensions) if file_extensions else None
     
     success_count = 0
     error_count = 0
+    found_count = 0
+    same_fs = None
+    # Submitted batches whose results haven't been collected yet, oldest first
+    pending = deque()
     
-    for file_path in files:
-        success, new_name, error = rename_file(file_path, output_path, copy_mode)
-        if success:
-            success_count += 1
-        else:
-            error_count += 1
-            logging.error(f"Failed to process {file_path.name}: {error}")
+    # Moves and copies of independent files are dominated by syscall latency,
+    # which releases the GIL, so a thread pool overlaps them across files.
+    # The directory listing is streamed straight into the pool: work starts
+    # on the first file and only a bounded number of entries is held in
+    # memory. DirEntry caches the file type from readdir, so filtering
+    # doesn't cost a stat per entry.
+    with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as pool, os.scandir(input_path) as it:
+        files = (
+            entry for entry in it
+            if entry.is_file() and (exts is None or _matches_extension(entry.name, exts))
+        )
+        
+        try:
+            in_place = os.path.samefile(input_path, output_path)
+        except OSError:
+            in_place = False
+        if in_place:
+            # Renamed files land in the directory being read; list it up
+            # front so they aren't picked up a second time
+            files = list(files)
+        if _INODE_SORT:
+            files = _inode_ordered(files)
+        
+        for batch in _iter_batches(files):
+            if same_fs is None:
+                # Create the output directory and check once whether moves
+                # can probably be plain renames (a shared st_dev can still be
+                # two mounts, so EXDEV is handled per file)
+                try:
+                    output_path.mkdir(parents=True, exist_ok=True)
+                    same_fs = os.stat(input_path).st_dev == os.stat(output_path).st_dev
+                except OSError as e:
+                    logging.error(f"Cannot use output directory {output_dir}: {e}")
+                    return
+                transfer = _select_transfer(copy_mode, same_fs)
+            
+            found_count += len(batch)
+            future = pool.submit(_rename_batch, batch, output_path, transfer)
+            pending.append((batch, future))
+            
+            # Keep the number of batches in flight bounded
+            if len(pending) > _MAX_WORKERS * 2:
+                successes, errors = _collect_batch(*pending.popleft())
+                success_count += successes
+                error_count += errors
+        
+        if not found_count:
+            logging.warning("No files found to process")
+            return
+        
+        while pending:
+            successes, errors = _collect_batch(*pending.popleft())
+            success_count += successes
+            error_count += errors
     
-    logging.info(f"Processing complete: {success_count} successful, {error_count} errors")
+    logging.info(
+        f"Processing complete: {found_count} files found, "
+        f"{success_count} successful, {error_count} errors"
+    )
 
 
-def main():
-    """Main function to handle command line arguments and execute the script."""
+def main(argv=None):
+    """
+    Main function to handle command line arguments and execute the script.
+    
+    Args:
+        argv (list): Arguments to parse instead of sys.argv[1:]
+    """
     parser = argparse.ArgumentParser(
+        prog=os.path.basename(__file__),
         description="Rename files by adding creation date prefix (yymmdd_hhmmss_original_name)"
     )
     
@@ -209,7 +740,7 @@ def main():
         help="Process a single file instead of a directory"
     )
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     # Setup logging
     setup_logging()
@@ -222,7 +753,17 @@ def main():
             logging.error(f"File does not exist: {args.file}")
             return
         
-        success, new_name, error = rename_file(args.file, args.output, args.copy)
+        # Create the output directory and check whether a move can probably
+        # be a plain rename, as process_directory does
+        try:
+            Path(args.output).mkdir(parents=True, exist_ok=True)
+            source_dir = os.path.dirname(os.path.abspath(args.file))
+            same_fs = os.stat(source_dir).st_dev == os.stat(args.output).st_dev
+        except OSError as e:
+            logging.error(f"Cannot use output directory {args.output}: {e}")
+            return
+        
+        success, new_name, error = rename_file(args.file, args.output, args.copy, same_fs)
         if success:
             logging.info(f"Successfully processed file: {new_name}")
         else: